@@ -15,6 +15,9 @@ setup(name='Warcat',
     install_requires=[
         'isodate',
     ],
+    extras_require={
+        'rapidgzip': ['rapidgzip'],
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)',
@@ -30,6 +30,9 @@ def main():
     arg_parser.add_argument('--force-read-gzip', action='store_true',
         help='Instead of guessing by filename, force reading archives as'
         ' gzip compressed')
+    arg_parser.add_argument('--parallel-gzip', action='store_true',
+        help='Decompress gzip archives in parallel using all processors.'
+        ' Requires rapidgzip.')
     arg_parser.add_argument('--verbose', action='count',
         help='Increase verbosity. Can be used more than once.')
     arg_parser.add_argument('--record', action='append',
@@ -91,6 +94,7 @@ def build_tool(class_, args):
     return class_(args.file,
         write_gzip=args.gzip,
         force_read_gzip=args.force_read_gzip,
+        parallel_read_gzip=args.parallel_gzip,
         out_file=get_file_buffer(args.output),
         read_record_ids=args.record,
         preserve_block=args.preserve_block,
@@ -109,11 +113,14 @@ def pass_command(args):
     out_file = get_file_buffer(args.output)
 
     for filename in args.file:
-        warc = WARC()
-        warc.load(filename, force_gzip=args.force_read_gzip)
-
-        for v in warc.iter_bytes():
-            out_file.write(v)
+        file_obj = WARC.open(filename, force_gzip=args.force_read_gzip,
+            parallel_gzip=args.parallel_gzip)
+
+        try:
+            for v in WARC().iter_bytes(WARC.iter_records(file_obj)):
+                out_file.write(v)
+        finally:
+            file_obj.close()
 
 
 def concat_command(args):
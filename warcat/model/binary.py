@@ -5,24 +5,73 @@ from warcat import util
 import abc
 import gzip
 import logging
+import mmap
+import os
 import tempfile
 
 
 _logger = logging.getLogger(__name__)
 
+READ_CHUNK_SIZE = 131072
+'''The number of bytes read at a time from a referenced file'''
+
 
 class BytesSerializable(metaclass=abc.ABCMeta):
     '''Metaclass that indicates this object can be serialized to bytes'''
 
     @abc.abstractmethod
     def iter_bytes(self):
-        '''Return an iterable of bytes'''
+        '''Return an iterable of bytes-like objects.
+
+        Items may be `memoryview` instances rather than `bytes`.
+        '''
         pass
 
     def __bytes__(self):
         return b''.join(self.iter_bytes())
 
 
+class _BufferedEmitter(object):
+    '''Coalesces small bytes fragments into larger chunks.
+
+    Fragments may be appended directly to :attr:`buffer` or passed through
+    :meth:`feed`. Chunks are released once at least `size` bytes have
+    accumulated. Fragments larger than `size` are passed through without
+    copying.
+    '''
+
+    def __init__(self, size=65536):
+        self.buffer = bytearray()
+        self.size = size
+
+    def feed(self, iterable):
+        '''Buffer the fragments and yield any full chunks'''
+
+        buf = self.buffer
+
+        for data in iterable:
+            if len(data) >= self.size:
+                if buf:
+                    yield bytes(buf)
+                    del buf[:]
+
+                yield data
+            else:
+                buf += data
+
+                if len(buf) >= self.size:
+                    yield bytes(buf)
+                    del buf[:]
+
+    def flush(self):
+        '''Yield the remaining buffered bytes'''
+
+        if self.buffer:
+            data = bytes(self.buffer)
+            del self.buffer[:]
+            yield data
+
+
 class StrSerializable(metaclass=abc.ABCMeta):
     '''Metaclass that indicates this object can be serialized to str'''
 
@@ -83,9 +132,48 @@ class BinaryFileRef(metaclass=abc.ABCMeta):
         self.file_offset = offset
         self.length = length
 
-    def iter_file(self, buffer_size=4096):
-        '''Return an iterable of bytes of the source data'''
+    def iter_file(self, buffer_size=READ_CHUNK_SIZE):
+        '''Return an iterable of bytes of the source data
+
+        Data of uncompressed files is returned as `memoryview` slices of a
+        memory map instead of copies.
+        '''
+
+        if self.filename and not self.filename.endswith('.gz'):
+            return self._iter_mmap(buffer_size)
+        else:
+            return self._iter_file_obj(buffer_size)
+
+    def _iter_mmap(self, buffer_size):
+        with open(self.filename, 'rb') as file_obj:
+            file_size = os.fstat(file_obj.fileno()).st_size
+
+            if self.length is not None:
+                end = min(file_size, self.file_offset + self.length)
+            else:
+                end = file_size
+
+            if end <= self.file_offset:
+                return
+
+            # Map only the referenced range. The map offset must be a
+            # multiple of the allocation granularity.
+            map_offset = self.file_offset \
+                - self.file_offset % mmap.ALLOCATIONGRANULARITY
+            delta = self.file_offset - map_offset
+
+            # The map is not closed explicitly because yielded views may
+            # outlive the generator. It is unmapped once they are released.
+            mmap_obj = mmap.mmap(file_obj.fileno(), end - map_offset,
+                access=mmap.ACCESS_READ, offset=map_offset)
+
+        view = memoryview(mmap_obj)
+        end -= map_offset
+
+        for offset in range(delta, end, buffer_size):
+            yield view[offset:min(offset + buffer_size, end)]
 
+    def _iter_file_obj(self, buffer_size):
         with self.get_file(safe=True) as file_obj:
             bytes_read = 0
 
@@ -139,7 +227,8 @@ class BinaryFileRef(metaclass=abc.ABCMeta):
                 self.filename or self.file_obj)
             temp_file_obj = tempfile.SpooledTemporaryFile(max_size=spool_size)
 
-            util.copyfile_obj(file_obj, temp_file_obj, max_length=self.length)
+            util.copyfile_obj(file_obj, temp_file_obj,
+                bufsize=READ_CHUNK_SIZE, max_length=self.length)
             temp_file_obj.seek(0)
             file_obj.seek(original_position)
 
@@ -10,17 +10,28 @@ import logging
 
 _logger = logging.getLogger(__name__)
 
+_FIELD_BLOCK_TYPES = {
+    'application/http': (HTTPHeader, False),
+    'application/warc-fields': (Fields, True),
+}
+'''Media types of blocks with fields mapped to field class and strictness'''
+
 
 class ContentBlock(BytesSerializable):
     @classmethod
     def load(cls, file_obj, length, content_type):
         '''Load and return :class:`BinaryBlock` or :class:`BlockWithPayload`'''
 
-        if content_type.startswith('application/http'):
+        if content_type:
+            media_type = content_type.split(';', 1)[0].strip().lower()
+            block_type = _FIELD_BLOCK_TYPES.get(media_type)
+        else:
+            block_type = None
+
+        if block_type:
+            field_cls, strict = block_type
             return BlockWithPayload.load(file_obj, length,
-                field_cls=HTTPHeader, strict=False)
-        elif content_type.startswith('application/warc-fields'):
-            return BlockWithPayload.load(file_obj, length, field_cls=Fields)
+                field_cls=field_cls, strict=strict)
         else:
             return BinaryBlock.load(file_obj, length)
 
@@ -111,7 +122,7 @@ class BlockWithPayload(ContentBlock):
     def length(self):
         '''Return the new computed length'''
 
-        return (len(bytes(self.fields)) + len(NEWLINE_BYTES) +
+        return (self.fields.byte_length() + len(NEWLINE_BYTES) +
             self.payload.length)
 
     def iter_bytes(self):
@@ -2,10 +2,8 @@
 # Copyright 2013 Christopher Foo <chris.foo@gmail.com>
 # Licensed under GPLv3. See COPYING.txt for details.
 from warcat.model.binary import StrSerializable, BytesSerializable
-from warcat.model.common import NEWLINE
-import collections
+from warcat.model.common import NEWLINE, NEWLINE_BYTES
 import logging
-import re
 
 
 _logger = logging.getLogger(__name__)
@@ -22,17 +20,25 @@ class Fields(StrSerializable, BytesSerializable):
         self._list = [] if field_list is None else field_list
 
     def __contains__(self, name):
-        return self.get(name) is not None
+        name = name.lower()
+
+        for k, v in self._list:
+            if k.lower() == name:
+                return True
+
+        return False
 
     def __iter__(self):
-        return self._list
+        return iter(self.keys())
 
     def __len__(self):
         return len(self._list)
 
     def __getitem__(self, name):
+        lower_name = name.lower()
+
         for k, v in self._list:
-            if k.lower() == name.lower():
+            if k.lower() == lower_name:
                 return v
 
         raise KeyError('{} not in fields'.format(name))
@@ -43,26 +49,34 @@ class Fields(StrSerializable, BytesSerializable):
         except KeyError:
             self._list.append((name, value))
         else:
-            del self[name]
-            self._list.insert(index, (name, value))
+            lower_name = name.lower()
+            self._list[index + 1:] = [x for x in self._list[index + 1:]
+                if x[0].lower() != lower_name]
+            self._list[index] = (name, value)
 
     def __delitem__(self, name):
-        self._list[:] = [x for x in self._list if x[0].lower() != name.lower()]
+        name = name.lower()
+        self._list[:] = [x for x in self._list if x[0].lower() != name]
 
     def add(self, name, value):
         '''Append a name-value field to the list'''
         self._list.append((name, value))
 
     def get(self, name, default=None):
-        try:
-            return self[name]
-        except KeyError:
-            return default
+        name = name.lower()
+
+        for k, v in self._list:
+            if k.lower() == name:
+                return v
+
+        return default
 
     def get_list(self, name):
         '''Return a list of values'''
 
-        return list([x for x in self._list if x[0].lower() == name.lower()])
+        name = name.lower()
+
+        return [x for x in self._list if x[0].lower() == name]
 
     def count(self, name):
         '''Count the number of times this name occurs in the list'''
@@ -72,8 +86,10 @@ class Fields(StrSerializable, BytesSerializable):
     def index(self, name):
         '''Return the index of the first occurance of given name'''
 
-        for i in range(len(self._list)):
-            if self._list[i][0].lower() == name.lower():
+        lower_name = name.lower()
+
+        for i, field in enumerate(self._list):
+            if field[0].lower() == lower_name:
                 return i
 
         raise KeyError('Name {} not found in fields'.format(name))
@@ -89,60 +105,99 @@ class Fields(StrSerializable, BytesSerializable):
     def values(self):
         return [x[1] for x in self._list]
 
+    def items(self):
+        return list(self._list)
+
     def clear(self):
         self._list[:] = []
 
     def iter_str(self):
         for name, value in self._list:
             if value:
-                yield '{}: {}'.format(name, value)
+                yield name + ': ' + str(value) + NEWLINE
             else:
-                yield '{}:'.format(name)
-            yield NEWLINE
+                yield name + ':' + NEWLINE
 
     def iter_bytes(self):
-        for s in self.iter_str():
-            yield s.encode()
+        yield ''.join(self.iter_str()).encode()
+
+    def write_bytes(self, buf):
+        '''Append the serialized fields to the given `bytearray`'''
+
+        buf += ''.join(self.iter_str()).encode()
+
+    def byte_length(self):
+        '''Return the length of the serialized fields in bytes'''
+
+        length = 0
+
+        for name, value in self._list:
+            # "name: value\r\n" or "name:\r\n"
+            if value:
+                length += len(name.encode()) + len(str(value).encode()) + 4
+            else:
+                length += len(name.encode()) + 3
+
+        return length
 
     @classmethod
-    def parse(cls, s, newline=NEWLINE):
-        '''Parse a named field string and return a :class:`Fields`'''
+    def parse(cls, s, newline=NEWLINE, fields=None):
+        '''Parse a named field string and return a :class:`Fields`
 
-        fields = Fields()
-        lines = collections.deque(
-            s.split(newline) if isinstance(newline, str) else
-            re.split(newline, s)
-        )
+        :param newline: A `str` or a compiled regular expression used to
+            split lines.
+        :param fields: If given, the :class:`Fields` to append to instead
+            of a new instance.
+        '''
 
-        while lines:
-            line = lines.popleft()
+        if fields is None:
+            fields = Fields()
+
+        lines = s.split(newline) if isinstance(newline, str) else \
+            newline.split(s)
+        index = 0
+        num_lines = len(lines)
+
+        while index < num_lines:
+            line = lines[index]
+            index += 1
 
             if not line:
                 continue
 
             name, value = line.split(':', 1)
             value = value.lstrip()
-            value = cls.join_multilines(value, lines)
+            value, index = cls.join_multilines(value, lines, index)
             fields.add(name, value)
 
         return fields
 
     @classmethod
-    def join_multilines(cls, value, lines):
-        '''Scan for multiline value which is prefixed with a space or tab'''
+    def join_multilines(cls, value, lines, index=0):
+        '''Scan for multiline value which is prefixed with a space or tab
+
+        :param lines: A `list` of lines.
+        :param index: The position in `lines` to start scanning.
+        :return: A tuple. The first item is the joined value. The second
+            item is the position of the next unconsumed line.
+        '''
+
+        num_lines = len(lines)
+        parts = [value]
 
-        while lines:
-            line = lines.popleft()
+        while index < num_lines:
+            line = lines[index]
 
             if not line:
+                index += 1
                 break
             if line[0] not in (' ', '\t'):
-                lines.appendleft(line)
                 break
 
-            value = '{}{}'.format(value, line[1:])
+            index += 1
+            parts.append(line[1:])
 
-        return value
+        return ''.join(parts), index
 
 
 class Header(StrSerializable, BytesSerializable):
@@ -189,8 +244,14 @@ class Header(StrSerializable, BytesSerializable):
         yield NEWLINE
 
     def iter_bytes(self):
-        for s in self.iter_str():
-            yield s.encode()
+        buf = bytearray()
+        self.write_bytes(buf)
+        yield bytes(buf)
+
+    def write_bytes(self, buf):
+        '''Append the serialized header to the given `bytearray`'''
+
+        buf += ''.join(self.iter_str()).encode()
 
 
 class HTTPHeader(Fields):
@@ -214,10 +275,8 @@ class HTTPHeader(Fields):
         http_headers = HTTPHeader()
         http_headers.status, s = s.split(newline, 1)
 
-        fields = super(HTTPHeader, cls).parse(s, newline=newline)
-        http_headers.list().extend(fields.list())
-
-        return http_headers
+        return super(HTTPHeader, cls).parse(s, newline=newline,
+            fields=http_headers)
 
     def iter_str(self):
         yield self.status
@@ -226,6 +285,10 @@ class HTTPHeader(Fields):
         for s in Fields.iter_str(self):
             yield s
 
+    def byte_length(self):
+        return (len(self.status.encode()) + len(NEWLINE_BYTES) +
+            Fields.byte_length(self))
+
 
 HTTPHeaders = HTTPHeader
 '''.. deprecated:: 2.1.1
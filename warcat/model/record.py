@@ -4,7 +4,7 @@
 from warcat import util
 from warcat.model.binary import BytesSerializable
 from warcat.model.block import ContentBlock, BinaryBlock
-from warcat.model.common import FIELD_DELIM_BYTES, NEWLINE_BYTES
+from warcat.model.common import FIELD_DELIM_BYTES
 from warcat.model.field import Header
 import isodate
 import logging
@@ -35,6 +35,7 @@ class Record(BytesSerializable):
         self.header = header or Header()
         self.content_block = None
         self.file_offset = None
+        self._date_cache = None
 
     @classmethod
     def load(cls, file_obj, preserve_block=False, check_block_length=True):
@@ -97,12 +98,19 @@ class Record(BytesSerializable):
 
     @property
     def date(self):
-        return isodate.parse_datetime(self.header.fields['WARC-Date'])
+        date_str = self.header.fields['WARC-Date']
+
+        # Cached by string so direct changes to the fields are noticed
+        if not self._date_cache or self._date_cache[0] != date_str:
+            self._date_cache = (date_str, util.parse_warc_date(date_str))
+
+        return self._date_cache[1]
 
     @date.setter
     def date(self, datetime_obj):
         self.header.fields['WARC-Date'] = isodate.datetime_isoformat(
             datetime_obj)
+        self._date_cache = None
 
     @property
     def warc_type(self):
@@ -122,7 +130,6 @@ class Record(BytesSerializable):
             for v in self.content_block.iter_bytes():
                 yield v
 
-        yield NEWLINE_BYTES
-        yield NEWLINE_BYTES
+        yield FIELD_DELIM_BYTES
 
 __all__ = ['Record']
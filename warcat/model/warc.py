@@ -2,21 +2,45 @@
 # Copyright 2013 Christopher Foo <chris.foo@gmail.com>
 # Licensed under GPLv3. See COPYING.txt for details.
 from warcat import util
-from warcat.model.binary import BytesSerializable
+from warcat.model.binary import BytesSerializable, _BufferedEmitter
 from warcat.model.common import FIELD_DELIM_BYTES
 from warcat.model.record import Record
+import atexit
+import collections
+import concurrent.futures
 import gzip
 import logging
+import mmap
+import multiprocessing
+import os
+import re
+import weakref
+
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
 
 
 _logger = logging.getLogger(__name__)
 
+_CONTENT_LENGTH_RE = re.compile(br'\r\ncontent-length:[ \t]*(\d+)',
+    re.IGNORECASE)
+
+_rapidgzip_files = weakref.WeakSet()
+
+
+@atexit.register
+def _close_rapidgzip_files():
+    for file_obj in list(_rapidgzip_files):
+        file_obj.close()
+
 
 class WARC(BytesSerializable):
     '''A Web ARChive file model.
 
     Typically, large streaming operations should use :func:`open` and
-    :func:`read_record` functions.
+    :func:`iter_records` or :func:`read_record` functions.
     '''
 
     def __init__(self):
@@ -35,25 +59,169 @@ class WARC(BytesSerializable):
     def read_file_object(self, file_object):
         '''Read records until the file object is exhausted'''
 
+        self.records.extend(self.iter_records(file_object))
+
+    @classmethod
+    def iter_records(cls, file_object, preserve_block=False,
+    check_block_length=True):
+        '''Return an iterator of records until the file object is exhausted.
+
+        Unlike :func:`read_file_object`, records are not kept in
+        :attr:`records`.
+
+        .. seealso:: :func:`read_record`
+        '''
+
         while True:
-            record, has_more = self.read_record(file_object)
-            self.records.append(record)
+            record, has_more = cls.read_record(file_object,
+                preserve_block=preserve_block,
+                check_block_length=check_block_length)
+
+            yield record
+
             if not has_more:
                 break
 
     @classmethod
-    def open(cls, filename, force_gzip=False):
+    def iter_records_parallel(cls, filename, workers=None, batch_size=1000,
+    preserve_block=False, check_block_length=True):
+        '''Return an iterator of records parsed using a pool of processes.
+
+        The record offsets are located first by scanning the file for
+        header boundaries and lengths. The records are then parsed by
+        worker processes in batches and returned in file order.
+
+        At most two batches per worker are in flight, so memory use is
+        bounded by the batch size rather than the archive size. Closing the
+        iterator early cancels batches that have not started.
+
+        Parsed records are pickled back to this process, which costs about
+        as much as parsing them. This only pays off with several processors
+        and many fields per record; otherwise use :func:`iter_records`.
+
+        Gzip compressed files cannot be read starting at a record offset,
+        so they are read sequentially using :func:`iter_records`.
+
+        :param workers: The number of processes. By default, the number
+            of processors.
+        :param batch_size: The number of records parsed by a process at a
+            time.
+        '''
+
+        if filename.endswith('.gz'):
+            _logger.info('Reading gzipped file %s sequentially', filename)
+            file_obj = cls.open(filename)
+
+            try:
+                for record in cls.iter_records(file_obj,
+                preserve_block=preserve_block,
+                check_block_length=check_block_length):
+                    yield record
+            finally:
+                file_obj.close()
+
+            return
+
+        offsets = cls.scan_record_offsets(filename)
+        batches = [offsets[i:i + batch_size]
+            for i in range(0, len(offsets), batch_size)]
+
+        _logger.info('Parsing %d records of %s in %d batches',
+            len(offsets), filename, len(batches))
+
+        max_pending = 2 * (workers or multiprocessing.cpu_count())
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+        pending = collections.deque()
+
+        try:
+            for batch in batches:
+                pending.append(executor.submit(_load_records, filename, batch,
+                    preserve_block, check_block_length))
+
+                if len(pending) >= max_pending:
+                    for record in pending.popleft().result():
+                        yield record
+
+            while pending:
+                for record in pending.popleft().result():
+                    yield record
+        finally:
+            for future in pending:
+                future.cancel()
+
+            executor.shutdown()
+
+    @classmethod
+    def scan_record_offsets(cls, filename):
+        '''Return a list of offsets of the records in an uncompressed file.
+
+        Only the header boundary and ``Content-Length`` of each record are
+        examined.
+        '''
+
+        offsets = []
+
+        with open(filename, 'rb') as file_obj:
+            if not os.fstat(file_obj.fileno()).st_size:
+                return offsets
+
+            mmap_obj = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with mmap_obj:
+            offset = 0
+
+            while offset < len(mmap_obj):
+                header_end = mmap_obj.find(FIELD_DELIM_BYTES, offset)
+
+                if header_end == -1:
+                    raise IOError('Header not terminated (offset={})'
+                        .format(offset))
+
+                match = _CONTENT_LENGTH_RE.search(mmap_obj, offset, header_end)
+
+                if not match:
+                    raise IOError('Header missing Content-Length (offset={})'
+                        .format(offset))
+
+                offsets.append(offset)
+                block_end = header_end + len(FIELD_DELIM_BYTES) \
+                    + int(match.group(1))
+                offset = block_end + len(FIELD_DELIM_BYTES)
+
+                if offset > len(mmap_obj) \
+                or mmap_obj[block_end:offset] != FIELD_DELIM_BYTES:
+                    raise IOError('Blocks not separated correctly (offset={})'
+                        .format(block_end))
+
+        return offsets
+
+    @classmethod
+    def open(cls, filename, force_gzip=False, parallel_gzip=False):
         '''Return a logical file object.
 
         :param filename: The path of the file. gzip compression is detected
             using file extension.
         :param force_gzip: Use gzip compression always.
+        :param parallel_gzip: Decompress gzip files in parallel using all
+            available cores. Requires the optional :mod:`rapidgzip` module.
         '''
 
         if filename.endswith('.gz') or force_gzip:
-            f = gzip.open(filename)
-            _logger.info('Opened gziped file %s', filename)
-            return util.DiskBufferedReader(f)
+            if parallel_gzip:
+                if not rapidgzip:
+                    raise ImportError('Parallel gzip requires rapidgzip')
+
+                f = util.DiskBufferedReader(
+                    rapidgzip.open(filename, parallelization=0))
+                # rapidgzip aborts the interpreter if its threads are still
+                # running at shutdown
+                _rapidgzip_files.add(f)
+                _logger.info('Opened gziped file %s with rapidgzip', filename)
+                return f
+            else:
+                f = gzip.open(filename)
+                _logger.info('Opened gziped file %s', filename)
+                return util.DiskBufferedReader(f)
         else:
             f = open(filename, 'rb')
             _logger.info('Opened file %s', filename)
@@ -88,10 +256,39 @@ class WARC(BytesSerializable):
         else:
             return (record, True)
 
-    def iter_bytes(self):
-        for record in self.records:
-            for v in record.iter_bytes():
+    def iter_bytes(self, records=None):
+        '''Return an iterable of bytes
+
+        :param records: An iterable of :class:`Record` to serialize instead
+            of :attr:`records`.
+        '''
+
+        emitter = _BufferedEmitter()
+
+        if records is None:
+            records = self.records
+
+        for record in records:
+            for v in emitter.feed(record.iter_bytes()):
                 yield v
 
+        for v in emitter.flush():
+            yield v
+
+
+def _load_records(filename, offsets, preserve_block, check_block_length):
+    '''Return a list of records loaded from the offsets of a file'''
+
+    records = []
+
+    with open(filename, 'rb') as file_obj:
+        for offset in offsets:
+            file_obj.seek(offset)
+            records.append(Record.load(file_obj,
+                preserve_block=preserve_block,
+                check_block_length=check_block_length))
+
+    return records
+
 
 __all__ = ['WARC']
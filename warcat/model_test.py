@@ -1,8 +1,13 @@
 import gzip
 
 from warcat import model, util
+import datetime
 import io
 import os.path
+import re
+import subprocess
+import sys
+import tempfile
 import unittest
 
 
@@ -27,6 +32,18 @@ class TestModel(unittest.TestCase):
             'The quick brown foxjumpsover\n   the lazy dog.',
             fields['multiline'])
         self.assertEqual('10', fields['content-length'])
+        self.assertEqual(len(bytes(fields)), fields.byte_length())
+
+        fields = model.HTTPHeader.parse('HTTP/1.1 200 OK\r\n' + fields_str)
+        fields.add('Empty', '')
+        self.assertEqual(len(bytes(fields)), fields.byte_length())
+
+    def test_fields_parse_regex_newline(self):
+        fields = model.Fields.parse('A: 1\nB: 2\r\nC: 3',
+            newline=re.compile(r'\r?\n'))
+
+        self.assertListEqual([('A', '1'), ('B', '2'), ('C', '3')],
+            fields.list())
 
     def test_fields(self):
         fields = model.Fields()
@@ -37,8 +54,12 @@ class TestModel(unittest.TestCase):
         self.assertListEqual(
             [('My-Name', 'a'), ('Animal', 'kitten'), ('my-name', 'b')],
             fields.list())
+        self.assertListEqual(['My-Name', 'Animal', 'my-name'], list(fields))
+        self.assertListEqual(fields.list(), fields.items())
         self.assertIn('my-name', fields)
         self.assertNotIn('content-length', fields)
+        self.assertEqual('a', fields.get('MY-NAME'))
+        self.assertEqual('x', fields.get('content-length', 'x'))
         self.assertEqual('a', fields['my-name'])
         self.assertEqual(2, fields.count('my-name'))
 
@@ -47,6 +68,47 @@ class TestModel(unittest.TestCase):
         self.assertEqual(1, fields.count('my-name'))
         self.assertEqual('kitten', fields['animal'])
 
+        field_list = fields.list()
+        self.assertEqual('kitten', fields['animal'])
+        field_list.insert(0, ('Animal', 'dog'))
+
+        self.assertEqual('dog', fields['animal'])
+        self.assertEqual(1, fields.index('my-name'))
+
+        fields['My-Name'] = 'd'
+
+        self.assertListEqual([('Animal', 'dog'), ('My-Name', 'd'),
+            ('Animal', 'kitten')], fields.list())
+
+        del fields['ANIMAL']
+
+        self.assertListEqual([('My-Name', 'd')], fields.list())
+
+    def test_buffered_emitter(self):
+        emitter = model.binary._BufferedEmitter(size=4)
+
+        self.assertEqual([b'abcd', b'efghij'],
+            list(emitter.feed([b'ab', b'cd', b'efghij', b'k'])))
+        self.assertEqual([b'k'], list(emitter.flush()))
+        self.assertEqual([], list(emitter.flush()))
+
+    def test_record_date(self):
+        record = model.Record()
+        record.header.fields['WARC-Date'] = '2013-04-09T00:11:14Z'
+
+        self.assertEqual(datetime.datetime(2013, 4, 9, 0, 11, 14,
+            tzinfo=datetime.timezone.utc), record.date)
+        self.assertIs(record.date, record.date)
+
+        record.header.fields['WARC-Date'] = '2014-01-02T03:04:05Z'
+
+        self.assertEqual(2014, record.date.year)
+
+        record.date = datetime.datetime(2015, 6, 7, 8, 9, 10,
+            tzinfo=datetime.timezone.utc)
+
+        self.assertEqual(2015, record.date.year)
+
     def test_build_model(self):
         warc = model.WARC()
 
@@ -108,6 +170,98 @@ class TestReading(unittest.TestCase):
         file_obj = record.content_block.binary_block.get_file()
         self.assertTrue(file_obj)
 
+    def test_iter_records(self):
+        file_obj = model.WARC.open(os.path.join(self.test_dir, 'at.warc'))
+
+        try:
+            records = list(model.WARC.iter_records(file_obj))
+        finally:
+            file_obj.close()
+
+        self.assertEqual(8, len(records))
+        self.assertEqual('warcinfo', records[0].warc_type)
+
+        warc = model.WARC()
+        warc.load(os.path.join(self.test_dir, 'at.warc'))
+        self.assertEqual(bytes(warc),
+            b''.join(model.WARC().iter_bytes(records)))
+
+    def test_iter_records_parallel(self):
+        for filename in ('at.warc', 'at.warc.gz'):
+            filename = os.path.join(self.test_dir, filename)
+            records = list(model.WARC.iter_records_parallel(filename,
+                workers=2, batch_size=3))
+
+            warc = model.WARC()
+            warc.load(filename)
+
+            self.assertEqual(8, len(records))
+            self.assertEqual(
+                [record.file_offset for record in warc.records],
+                [record.file_offset for record in records])
+            self.assertEqual(bytes(warc),
+                b''.join(model.WARC().iter_bytes(records)))
+
+        records = model.WARC.iter_records_parallel(
+            os.path.join(self.test_dir, 'at.warc'), workers=1, batch_size=1)
+        self.assertEqual('warcinfo', next(records).warc_type)
+        records.close()
+
+    def test_scan_record_offsets_bad_separator(self):
+        with open(os.path.join(self.test_dir, 'at.warc'), 'rb') as file:
+            data = file.read()
+
+        first_record_end = model.WARC.scan_record_offsets(
+            os.path.join(self.test_dir, 'at.warc'))[1]
+        corrupted_data = data[:first_record_end - 4] + b'XXXX' \
+            + data[first_record_end:]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'test.warc')
+
+            for bad_data in (data[:-10], corrupted_data):
+                with open(filename, 'wb') as file:
+                    file.write(bad_data)
+
+                self.assertRaisesRegex(IOError,
+                    'Blocks not separated correctly',
+                    model.WARC.scan_record_offsets, filename)
+
+    def test_read_content_types(self):
+        http_block = b'HTTP/1.1 200 OK\r\nServer: test\r\n\r\nhello'
+        data = (
+            b'WARC/1.0\r\n'
+            b'WARC-Record-ID: <urn:uuid:a>\r\n'
+            b'Content-Length: 5\r\n\r\n'
+            b'hello\r\n\r\n'
+            b'WARC/1.0\r\n'
+            b'WARC-Record-ID: <urn:uuid:b>\r\n'
+            b'Content-Type: Application/HTTP; msgtype=response\r\n'
+            b'Content-Length: ' + str(len(http_block)).encode() +
+            b'\r\n\r\n' + http_block + b'\r\n\r\n'
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'test.warc')
+
+            with open(filename, 'wb') as file:
+                file.write(data)
+
+            warc = model.WARC()
+            warc.load(filename)
+
+            self.assertEqual(2, len(warc.records))
+            self.assertIsInstance(warc.records[0].content_block,
+                model.BinaryBlock)
+            self.assertEqual(b'hello', bytes(warc.records[0].content_block))
+
+            content_block = warc.records[1].content_block
+            self.assertIsInstance(content_block, model.BlockWithPayload)
+            self.assertIsInstance(content_block.fields, model.HTTPHeader)
+            self.assertEqual(200, content_block.fields.status_code)
+            self.assertEqual('test', content_block.fields['server'])
+            self.assertEqual(b'hello', bytes(content_block.payload))
+
     def test_read_at_warc_gzip(self):
         warc = model.WARC()
 
@@ -118,6 +272,38 @@ class TestReading(unittest.TestCase):
         file_obj = record.content_block.binary_block.get_file()
         self.assertTrue(file_obj)
 
+    def test_open_gzip(self):
+        file_obj = model.WARC.open(os.path.join(self.test_dir, 'at.warc.gz'))
+
+        try:
+            self.assertIsInstance(file_obj.raw, gzip.GzipFile)
+            warc = model.WARC()
+            warc.read_file_object(file_obj)
+            self.assertEqual(8, len(warc.records))
+        finally:
+            file_obj.close()
+
+    @unittest.skipUnless(model.warc.rapidgzip, 'rapidgzip not installed')
+    def test_open_parallel_gzip(self):
+        filename = os.path.join(self.test_dir, 'at.warc.gz')
+        file_obj = model.WARC.open(filename, parallel_gzip=True)
+        parallel_warc = model.WARC()
+
+        try:
+            parallel_warc.read_file_object(file_obj)
+        finally:
+            file_obj.close()
+
+        warc = model.WARC()
+        warc.load(filename)
+        self.assertEqual(bytes(warc), bytes(parallel_warc))
+
+        # Files left open must not abort the interpreter at exit
+        subprocess.check_call([sys.executable, '-c',
+            'from warcat.model import WARC\n'
+            'f = WARC.open({!r}, parallel_gzip=True)\n'
+            'WARC.read_record(f)\n'.format(filename)])
+
     def test_read_at_warc_memory_gzip(self):
         warc = model.WARC()
 
@@ -136,6 +322,25 @@ class TestReading(unittest.TestCase):
         file_obj = record.content_block.binary_block.get_file()
         self.assertTrue(file_obj)
 
+    def test_binary_block_iter_file(self):
+        filename = os.path.join(self.test_dir, 'at.warc')
+
+        with open(filename, 'rb') as file:
+            data = file.read()
+
+        block = model.BinaryBlock()
+        block.set_file(filename, offset=5, length=10)
+        self.assertEqual(data[5:15], b''.join(block.iter_file(buffer_size=3)))
+
+        block.set_file(filename, offset=len(data) - 4)
+        self.assertEqual(data[-4:], b''.join(block.iter_file()))
+
+        block.set_file(filename, offset=8197, length=5000)
+        self.assertEqual(data[8197:13197], b''.join(block.iter_file()))
+
+        block.set_file(filename, offset=8197, length=0)
+        self.assertEqual(b'', b''.join(block.iter_file()))
+
     def test_warc_to_bytes(self):
         warc = model.WARC()
 
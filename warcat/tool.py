@@ -52,7 +52,8 @@ class BaseIterateTool(metaclass=abc.ABCMeta):
 
     def __init__(self, filenames, out_file=None, write_gzip=False,
     force_read_gzip=None, read_record_ids=None, preserve_block=True,
-    out_dir=None, print_progress=False, keep_going=False):
+    out_dir=None, print_progress=False, keep_going=False,
+    parallel_read_gzip=False):
         if not out_file:
             try:
                 out_file = sys.stdout.buffer
@@ -62,6 +63,7 @@ class BaseIterateTool(metaclass=abc.ABCMeta):
         self.filenames = filenames
         self.out_file = out_file
         self.force_read_gzip = force_read_gzip
+        self.parallel_read_gzip = parallel_read_gzip
         self.write_gzip = write_gzip
         self.current_filename = None
         self.read_record_ids = read_record_ids
@@ -87,46 +89,48 @@ class BaseIterateTool(metaclass=abc.ABCMeta):
             self.record_order = 0
             self.current_filename = filename
 
-            f = model.WARC.open(filename, force_gzip=self.force_read_gzip)
-
-            while True:
-                record, has_more = model.WARC.read_record(f,
-                    preserve_block=self.preserve_block,
-                    check_block_length=self.check_block_length)
-
-                skip = False
-
-                if self.read_record_ids:
-                    if record.record_id not in self.read_record_ids:
-                        skip = True
-
-                if skip:
-                    _logger.debug('Skipping %s due to filter',
-                        record.record_id)
-                else:
-                    try:
-                        self.action(record)
-                    except Exception as e:
-                        if self.keep_going:
-                            _logger.exception('Error on record %s',
-                                record.record_id)
-                        else:
-                            raise
-
-                if self.print_progress and self.num_records % 100 == 0:
-                    s = next(throbber_iter)
-                    sys.stderr.write('\b' * len(progress_msg))
-                    progress_msg = '{} {} '.format(self.num_records, s)
-                    sys.stderr.write(progress_msg)
-                    sys.stderr.flush()
-
-                self.record_order += 1
-                self.num_records += 1
-
-                if not has_more:
-                    break
+            f = model.WARC.open(filename, force_gzip=self.force_read_gzip,
+                parallel_gzip=self.parallel_read_gzip)
 
-            f.close()
+            try:
+                while True:
+                    record, has_more = model.WARC.read_record(f,
+                        preserve_block=self.preserve_block,
+                        check_block_length=self.check_block_length)
+
+                    skip = False
+
+                    if self.read_record_ids:
+                        if record.record_id not in self.read_record_ids:
+                            skip = True
+
+                    if skip:
+                        _logger.debug('Skipping %s due to filter',
+                            record.record_id)
+                    else:
+                        try:
+                            self.action(record)
+                        except Exception as e:
+                            if self.keep_going:
+                                _logger.exception('Error on record %s',
+                                    record.record_id)
+                            else:
+                                raise
+
+                    if self.print_progress and self.num_records % 100 == 0:
+                        s = next(throbber_iter)
+                        sys.stderr.write('\b' * len(progress_msg))
+                        progress_msg = '{} {} '.format(self.num_records, s)
+                        sys.stderr.write(progress_msg)
+                        sys.stderr.flush()
+
+                    self.record_order += 1
+                    self.num_records += 1
+
+                    if not has_more:
+                        break
+            finally:
+                f.close()
 
         self.postprocess()
 
@@ -4,9 +4,11 @@
 import collections
 import datetime
 import email.utils
+import gzip
 import hashlib
 import http.client
 import io
+import isodate
 import logging
 import os
 import tempfile
@@ -24,14 +26,15 @@ def printable_str_to_str(s):
         .replace(r'\t', '\t')
 
 
-def find_file_pattern(file_obj, pattern, bufsize=512, limit=4096,
+def find_file_pattern(file_obj, pattern, bufsize=4096, limit=4096,
 inclusive=False):
     '''Find the offset from current position of pattern'''
 
     original_position = file_obj.tell()
     bytes_read = 0
-    # FIXME: don't accumulate growing buffer
-    search_buf = io.BytesIO()
+    # Bytes kept from the previous chunk in case the pattern spans chunks
+    tail = b''
+    tail_size = len(pattern) - 1
 
     while True:
         if limit:
@@ -44,14 +47,11 @@ inclusive=False):
         if not data:
             break
 
-        search_buf.write(data)
+        search_buf = tail + data if tail else data
+        index = search_buf.find(pattern)
 
-        try:
-            index = search_buf.getvalue().index(pattern)
-        except ValueError:
-            pass
-        else:
-            offset = index
+        if index != -1:
+            offset = bytes_read - len(tail) + index
 
             if inclusive:
                 offset += len(pattern)
@@ -61,6 +61,9 @@ inclusive=False):
 
         bytes_read += len(data)
 
+        if tail_size:
+            tail = search_buf[-tail_size:]
+
     file_obj.seek(original_position)
 
     raise ValueError('Search for pattern exhausted')
@@ -85,6 +88,9 @@ class DiskBufferedReader(io.BufferedIOBase):
     # Copyright 2001-2011 Python Software Foundation
     # Licensed under Python Software Foundation License Version 2
 
+    RAW_READ_SIZE = 1048576
+    '''The number of bytes read at a time from the raw file'''
+
     def __init__(self, raw, disk_buffer_size=104857600, spool_size=10485760):
         io.BufferedIOBase.__init__(self)
         self._raw = raw
@@ -117,8 +123,9 @@ class DiskBufferedReader(io.BufferedIOBase):
                 self._block_file = tempfile.SpooledTemporaryFile(
                     max_size=self._spool_size)
 
-                self._raw.seek(self._block_index * self._disk_buffer_size)
+                self._seek_raw(self._block_index * self._disk_buffer_size)
                 copyfile_obj(self.raw, self._block_file,
+                    bufsize=self.RAW_READ_SIZE,
                     max_length=self._disk_buffer_size)
                 self._cache.put(self._block_index, self._block_file)
 
@@ -127,6 +134,28 @@ class DiskBufferedReader(io.BufferedIOBase):
 
             self._block_file.seek(0)
 
+    def _seek_raw(self, position):
+        '''Seek the raw file.
+
+        Gzip files seek forward by decompressing and discarding small
+        reads. Large chunks are skipped over instead.
+        '''
+
+        if not isinstance(self._raw, gzip.GzipFile) \
+        or position < self._raw.tell():
+            self._raw.seek(position)
+            return
+
+        bytes_left = position - self._raw.tell()
+
+        while bytes_left > 0:
+            data = self._raw.read1(min(self.RAW_READ_SIZE, bytes_left))
+
+            if not data:
+                break
+
+            bytes_left -= len(data)
+
     def tell(self):
         return self._offset
 
@@ -137,12 +166,15 @@ class DiskBufferedReader(io.BufferedIOBase):
         with self._lock:
             if whence == 1:
                 self._offset += pos
+            else:
+                self._offset = pos
 
-            self._offset = pos
             index = self._offset // self._disk_buffer_size
             self._set_block(index)
             self._block_file.seek(self._offset % self._disk_buffer_size)
 
+        return self._offset
+
     def read(self, n=None):
         buf = io.BytesIO()
         bytes_left = n
@@ -170,6 +202,10 @@ class DiskBufferedReader(io.BufferedIOBase):
             self.seek(original_position)
         return data
 
+    def close(self):
+        if not self.closed:
+            self.raw.close()
+
     def seekable(self):
         return self.raw.seekable()
 
@@ -241,18 +277,34 @@ class FileCache(object):
 
 def copyfile_obj(source, dest, bufsize=4096, max_length=None,
 write_attr_name='write'):
-    '''Like :func:`shutil.copyfileobj` but with limit on how much to copy'''
+    '''Like :func:`shutil.copyfileobj` but with limit on how much to copy
+
+    If the source implements ``readinto``, a single buffer is reused for all
+    reads.
+    '''
 
     bytes_read = 0
     write_func = getattr(dest, write_attr_name)
 
+    # The io.BufferedIOBase default reads and then copies into the buffer
+    if getattr(type(source), 'readinto', None) is io.BufferedIOBase.readinto:
+        readinto_func = None
+    else:
+        readinto_func = getattr(source, 'readinto', None)
+
+    if readinto_func:
+        buf_view = memoryview(bytearray(bufsize))
+
     while True:
         if max_length != None:
             read_size = min(bufsize, max_length - bytes_read)
         else:
             read_size = bufsize
 
-        data = source.read(read_size)
+        if readinto_func:
+            data = buf_view[:readinto_func(buf_view[:read_size]) or 0]
+        else:
+            data = source.read(read_size)
 
         if not data:
             break
@@ -376,5 +428,20 @@ def parse_http_date(s):
     return d
 
 
+def parse_warc_date(s):
+    '''Parse a WARC-Date value.
+
+    The usual ``YYYY-MM-DDThh:mm:ssZ`` form is parsed directly. Other
+    forms are handled by :func:`isodate.parse_datetime`.
+    '''
+
+    if len(s) == 20 and s[19] == 'Z' and s[4] == s[7] == '-' \
+    and s[10] == 'T' and s[13] == s[16] == ':':
+        return datetime.datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=isodate.UTC)
+
+    return isodate.parse_datetime(s)
+
+
 file_cache = FileCache()
 '''The :class:`FileCache` instance'''
@@ -1,5 +1,6 @@
 from warcat import util
 import datetime
+import gzip
 import io
 import os.path
 import unittest
@@ -37,6 +38,24 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(b'1', f.read(1))
         self.assertEqual(b'2', f.peek(1))
 
+    def test_disk_buffered_reader_gzip(self):
+        test_data = b'0123456789' * 100
+        raw = gzip.GzipFile(fileobj=io.BytesIO(gzip.compress(test_data)))
+
+        f = util.DiskBufferedReader(raw, disk_buffer_size=42)
+        f.RAW_READ_SIZE = 5
+
+        self.assertEqual(b'0', f.read(1))
+
+        self.assertEqual(503, f.seek(502, 1))
+        self.assertEqual(b'345', f.read(3))
+
+        f.seek(45)
+        self.assertEqual(b'56', f.read(2))
+
+        f.seek(990)
+        self.assertEqual(b'0123456789', f.read(20))
+
     def test_find_file_pattern_loop_boundary(self):
         for i in range(1000):
             data = b'x' * i + b'\r\n\r\nabcdefghijklmnop'
@@ -45,6 +64,37 @@ class TestUtil(unittest.TestCase):
 
             self.assertEqual(i, util.find_file_pattern(f, b'\r\n\r\n'))
 
+    def test_find_file_pattern_chunk_boundary(self):
+        data = b'abcdefg\r\n\r\nhijklmnop'
+
+        for bufsize in range(1, len(data) + 1):
+            f = io.BytesIO(data)
+
+            self.assertEqual(7, util.find_file_pattern(f, b'\r\n\r\n',
+                bufsize=bufsize))
+
+        f = io.BytesIO(data)
+
+        self.assertRaises(ValueError, util.find_file_pattern, f,
+            b'\r\n\r\n', limit=10)
+        self.assertEqual(0, f.tell())
+
+    def test_copyfile_obj(self):
+        source = io.BytesIO(b'0123456789' * 10)
+        dest = io.BytesIO()
+
+        util.copyfile_obj(source, dest, bufsize=7, max_length=95)
+
+        self.assertEqual(b'0123456789' * 9 + b'01234', dest.getvalue())
+
+        source = util.DiskBufferedReader(io.BytesIO(b'0123456789' * 10),
+            disk_buffer_size=42)
+        dest = io.BytesIO()
+
+        util.copyfile_obj(source, dest, bufsize=7, max_length=95)
+
+        self.assertEqual(b'0123456789' * 9 + b'01234', dest.getvalue())
+
     def test_split_url_to_filename(self):
         self.assertEqual(['example.com', 'index.php_article=Main_Page'],
             util.split_url_to_filename(
@@ -77,3 +127,14 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(datetime.datetime(1995, 11, 20, 19, 12, 8,
             tzinfo=datetime.timezone(datetime.timedelta(-1, 68400))),
             util.parse_http_date('Mon, 20 Nov 1995 19:12:08 -0500'))
+
+    def test_parse_warc_date(self):
+        self.assertEqual(datetime.datetime(2013, 4, 9, 0, 11, 14,
+            tzinfo=datetime.timezone.utc),
+            util.parse_warc_date('2013-04-09T00:11:14Z'))
+        self.assertEqual(datetime.datetime(2013, 4, 9, 0, 11, 14, 500000,
+            tzinfo=datetime.timezone.utc),
+            util.parse_warc_date('2013-04-09T00:11:14.5Z'))
+        self.assertEqual(datetime.datetime(2013, 4, 9, 0, 11, 14,
+            tzinfo=datetime.timezone(datetime.timedelta(hours=-5))),
+            util.parse_warc_date('2013-04-09T00:11:14-05:00'))